@@ -55,65 +55,48 @@ class AccessibilityAnalyzer:
         """Check color contrast ratios"""
         issues = []
         
-        # Sample colors from different regions
+        # Sample 20 random 50x50 regions as one (20, 2500, 3) batch
         height, width = image_array.shape[:2]
-        samples = []
-        
-        # Sample 20 random regions
-        for _ in range(20):
-            x = np.random.randint(0, width - 50)
-            y = np.random.randint(0, height - 50)
-            region = image_array[y:y+50, x:x+50]
-            
-            # Get foreground (darker) and background (lighter) colors
-            colors = region.reshape(-1, 3)
-            unique_colors = np.unique(colors, axis=0)
-            
-            if len(unique_colors) >= 2:
-                # Sort by luminance
-                luminances = [self._relative_luminance(c) for c in unique_colors]
-                sorted_indices = np.argsort(luminances)
-                
-                fg_color = unique_colors[sorted_indices[0]]
-                bg_color = unique_colors[sorted_indices[-1]]
-                
-                contrast = self._contrast_ratio(fg_color, bg_color)
-                
-                if contrast < self.MIN_CONTRAST_NORMAL:
-                    issues.append({
-                        "type": "Low Contrast",
-                        "severity": "high",
-                        "location": f"Region at ({x}, {y})",
-                        "contrast_ratio": round(contrast, 2),
-                        "required": self.MIN_CONTRAST_NORMAL,
-                        "colors": {
-                            "foreground": fg_color.tolist(),
-                            "background": bg_color.tolist()
-                        }
-                    })
+        num_samples = 20
+        xs = np.random.randint(0, width - 50, size=num_samples)
+        ys = np.random.randint(0, height - 50, size=num_samples)
+        regions = np.stack([
+            image_array[y:y+50, x:x+50] for x, y in zip(xs, ys)
+        ]).reshape(num_samples, -1, 3)
+        
+        # Foreground is the darkest pixel, background the lightest
+        luminances = self._luminance_vec(regions)
+        rows = np.arange(num_samples)
+        fg_idx = luminances.argmin(axis=1)
+        bg_idx = luminances.argmax(axis=1)
+        fg_colors = regions[rows, fg_idx]
+        bg_colors = regions[rows, bg_idx]
+        contrasts = (luminances[rows, bg_idx] + 0.05) / (luminances[rows, fg_idx] + 0.05)
+        
+        # Single-colour regions have no foreground/background pair
+        has_two_colors = (regions != regions[:, :1]).any(axis=(1, 2))
+        
+        for i in np.flatnonzero(has_two_colors & (contrasts < self.MIN_CONTRAST_NORMAL)):
+            issues.append({
+                "type": "Low Contrast",
+                "severity": "high",
+                "location": f"Region at ({xs[i]}, {ys[i]})",
+                "contrast_ratio": round(float(contrasts[i]), 2),
+                "required": self.MIN_CONTRAST_NORMAL,
+                "colors": {
+                    "foreground": fg_colors[i].tolist(),
+                    "background": bg_colors[i].tolist()
+                }
+            })
         
         return issues
     
-    def _relative_luminance(self, rgb: np.ndarray) -> float:
-        """Calculate relative luminance (WCAG formula)"""
-        r, g, b = rgb / 255.0
-        
-        # Apply gamma correction
-        r = r / 12.92 if r <= 0.03928 else ((r + 0.055) / 1.055) ** 2.4
-        g = g / 12.92 if g <= 0.03928 else ((g + 0.055) / 1.055) ** 2.4
-        b = b / 12.92 if b <= 0.03928 else ((b + 0.055) / 1.055) ** 2.4
-        
-        return 0.2126 * r + 0.7152 * g + 0.0722 * b
-    
-    def _contrast_ratio(self, color1: np.ndarray, color2: np.ndarray) -> float:
-        """Calculate contrast ratio between two colors"""
-        l1 = self._relative_luminance(color1)
-        l2 = self._relative_luminance(color2)
-        
-        lighter = max(l1, l2)
-        darker = min(l1, l2)
-        
-        return (lighter + 0.05) / (darker + 0.05)
+    @staticmethod
+    def _luminance_vec(rgb: np.ndarray) -> np.ndarray:
+        """Relative luminance (WCAG formula) for an array of RGB triples (..., 3)"""
+        c = rgb / 255.0
+        c = np.where(c <= 0.03928, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+        return c @ np.array([0.2126, 0.7152, 0.0722])
     
     def _check_color_usage(self, image_array: np.ndarray) -> List[Dict]:
         """Check for color-only information"""
@@ -160,12 +143,12 @@ class AccessibilityAnalyzer:
         if len(sample) < 2:
             return 4.5
         
-        contrasts = []
-        for i in range(0, len(sample)-1, 2):
-            contrast = self._contrast_ratio(sample[i], sample[i+1])
-            contrasts.append(contrast)
+        # Contrast between consecutive pixel pairs (0,1), (2,3), ...
+        pairs = len(sample) // 2
+        luminances = self._luminance_vec(sample[:pairs * 2]).reshape(pairs, 2)
+        ratios = (luminances.max(axis=1) + 0.05) / (luminances.min(axis=1) + 0.05)
         
-        return np.mean(contrasts) if contrasts else 4.5
+        return float(ratios.mean())
     
     def _generate_recommendations(self, contrast_issues, color_issues, size_issues) -> List[str]:
         """Generate actionable recommendations"""
@@ -1,17 +1,96 @@
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 from PIL import Image
-import torchvision.transforms as transforms
+import torchvision.transforms.functional as TF
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Optional
+import atexit
+import functools
+import hashlib
+import io
 import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Optional ONNX Runtime backend for the saliency model
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ort = None
+    ONNXRUNTIME_AVAILABLE = False
+
+# Derived model artifacts (ONNX export, TorchScript, INT8) live here rather than
+# next to the checkpoint, which may be read-only
+MODEL_CACHE_DIR = os.environ.get(
+    "ARAI_MODEL_CACHE_DIR", os.path.join(tempfile.gettempdir(), "arai_model_cache")
+)
+
+
+def _artifact_path(model_path: str, suffix: str) -> str:
+    """
+    Cache path for an artifact derived from model_path. The name is keyed on
+    the checkpoint's path, size and mtime, so a changed checkpoint never picks
+    up an artifact built from an older one.
+    """
+    stat = os.stat(model_path)
+    key = f"{os.path.abspath(model_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+    return os.path.join(MODEL_CACHE_DIR, f"{stem}-{digest}{suffix}")
+
+
+def _save_scripted(module, path: str):
+    """Save a TorchScript module via a temporary name so readers never see a partial file"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        torch.jit.save(module, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+# Input shape is fixed, so let cuDNN benchmark and cache the fastest conv algorithms
+torch.backends.cudnn.benchmark = True
+
+
+def _build_jet_lut() -> np.ndarray:
+    """256x3 uint8 lookup table matching matplotlib's 'jet' colormap"""
+    # Piecewise-linear anchors from matplotlib's _jet_data
+    anchors = {
+        'red': ([0., 0.35, 0.66, 0.89, 1.], [0., 0., 1., 1., 0.5]),
+        'green': ([0., 0.125, 0.375, 0.64, 0.91, 1.], [0., 0., 1., 1., 0., 0.]),
+        'blue': ([0., 0.11, 0.34, 0.65, 1.], [0.5, 1., 1., 0., 0.]),
+    }
+    x = np.linspace(0, 1, 256)
+    lut = np.stack([np.interp(x, *anchors[c]) for c in ('red', 'green', 'blue')], axis=1)
+    return (lut * 255).astype(np.uint8)
+
+
+# Red = high attention; indexed directly with uint8 saliency values
+JET_LUT = _build_jet_lut()
 
 
 class SaliencyModel(nn.Module):
-    """U-Net style architecture for saliency prediction"""
+    """
+    U-Net style architecture for saliency prediction
+    
+    upsample selects the decoder's 2x upsampling: 'transpose' (2x2 transposed
+    conv, what existing checkpoints use) or 'bilinear' (bilinear upsample
+    followed by a 3x3 conv, cheaper and free of checkerboard artifacts)
+    """
+    
+    UPSAMPLE_MODES = ('transpose', 'bilinear')
     
-    def __init__(self):
+    def __init__(self, upsample: str = 'transpose'):
         super(SaliencyModel, self).__init__()
+        if upsample not in self.UPSAMPLE_MODES:
+            raise ValueError(f"upsample must be one of {self.UPSAMPLE_MODES}, got {upsample!r}")
+        self.upsample = upsample
         
         # Encoder
         self.enc1 = self._conv_block(3, 64)
@@ -27,13 +106,13 @@ class SaliencyModel(nn.Module):
         self.bottleneck = self._conv_block(256, 512)
         
         # Decoder
-        self.upconv3 = nn.ConvTranspose2d(512, 256, 2, stride=2)
+        self.upconv3 = self._up_block(512, 256)
         self.dec3 = self._conv_block(512, 256)
         
-        self.upconv2 = nn.ConvTranspose2d(256, 128, 2, stride=2)
+        self.upconv2 = self._up_block(256, 128)
         self.dec2 = self._conv_block(256, 128)
         
-        self.upconv1 = nn.ConvTranspose2d(128, 64, 2, stride=2)
+        self.upconv1 = self._up_block(128, 64)
         self.dec1 = self._conv_block(128, 64)
         
         # Output
@@ -48,6 +127,19 @@ class SaliencyModel(nn.Module):
             nn.ReLU(inplace=True)
         )
     
+    def _up_block(self, in_channels, out_channels):
+        if self.upsample == 'bilinear':
+            return nn.Sequential(
+                nn.Upsample(scale_factor=2, mode='bilinear', align_corners=False),
+                nn.Conv2d(in_channels, out_channels, 3, padding=1)
+            )
+        return nn.ConvTranspose2d(in_channels, out_channels, 2, stride=2)
+    
+    @staticmethod
+    def upsample_mode_of(state_dict) -> str:
+        """Infer the decoder upsampling a checkpoint was trained with"""
+        return 'bilinear' if 'upconv3.1.weight' in state_dict else 'transpose'
+    
     def forward(self, x):
         # Encoder
         enc1 = self.enc1(x)
@@ -79,43 +171,264 @@ class AttentionAnalyzer:
     Generates heatmaps and analyzes attention distribution
     """
     
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, use_onnx: bool = False,
+                 quantize: bool = False, calibration_images: Optional[List[str]] = None,
+                 input_size: int = 256):
+        # The U-Net pools three times, so the side must divide by 8. Smaller
+        # sizes (e.g. 128) cut conv FLOPs quadratically at some accuracy cost
+        # unless the model was trained at that size.
+        if input_size % 8:
+            raise ValueError(f"input_size must be a multiple of 8, got {input_size}")
+        self.input_size = input_size
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        self.ort_session = None
         
-        # Load model
-        self.model = SaliencyModel().to(self.device)
+        # Load model; the decoder variant follows the checkpoint
         if os.path.exists(model_path):
-            self.model.load_state_dict(torch.load(model_path, map_location=self.device))
+            # mmap pages weights in lazily; weights_only refuses arbitrary pickles
+            state_dict = torch.load(model_path, map_location=self.device,
+                                    mmap=True, weights_only=True)
+            self.model = SaliencyModel(SaliencyModel.upsample_mode_of(state_dict)).to(self.device)
+            self.model.load_state_dict(state_dict)
             self.model.eval()
             print(f"Loaded saliency model from {model_path}")
+            if use_onnx and ONNXRUNTIME_AVAILABLE:
+                self.ort_session = self._load_onnx(model_path)
         else:
+            self.model = SaliencyModel().to(self.device)
             print(f"Warning: Model not found at {model_path}. Using random predictions.")
         
-        # Image preprocessing
-        self.transform = transforms.Compose([
-            transforms.Resize((256, 256)),
-            transforms.ToTensor(),
-        ])
+        # On CPU an INT8 model roughly halves conv latency on the wide bottleneck
+        self.quantized = False
+        if (quantize and self.device.type == 'cpu' and self.ort_session is None
+                and os.path.exists(model_path)):
+            quantized_model = self._load_quantized(model_path, calibration_images)
+            if quantized_model is not None:
+                self.model = quantized_model
+                self.quantized = True
+        
+        # NHWC layout lets cuDNN pick tensor-core conv kernels
+        if not self.quantized:
+            self.model = self.model.to(memory_format=torch.channels_last)
+        
+        # FP32 on CPU: script the U-Net and let optimize_for_inference fold
+        # Conv+ReLU into fused MKLDNN kernels
+        if (self.device.type == 'cpu' and not self.quantized
+                and self.ort_session is None and os.path.exists(model_path)):
+            self.model = self._optimize_for_cpu(model_path)
+        
+        # On GPU run the U-Net in reduced precision (bf16 on Ampere+, else fp16)
+        # and compile it; input shape is fixed so CUDA graphs capture cleanly
+        self.use_amp = self.device.type == 'cuda'
+        self.amp_dtype = torch.float32
+        if self.use_amp:
+            self.amp_dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+            if self.ort_session is None:
+                self.model = torch.compile(self.model, mode="reduce-overhead", fullgraph=True)
+        
+        # Reusable NHWC staging buffers for model input, one per batch size;
+        # pinned on GPU so the host-to-device copy can run asynchronously.
+        # The lock serializes their use.
+        self._input_bufs = {
+            1: torch.empty((1, 3, input_size, input_size),
+                           memory_format=torch.channels_last,
+                           pin_memory=self.device.type == 'cuda')
+        }
+        self._input_lock = threading.Lock()
+        
+        # Side streams for host<->device copies, overlapping them with compute
+        if self.device.type == 'cuda':
+            self._upload_stream = torch.cuda.Stream()
+            self._download_stream = torch.cuda.Stream()
+        
+        # Fixed regions of the input_size x input_size saliency map used for scoring
+        half, third, quarter = input_size // 2, input_size // 3, input_size // 4
+        self._quad_pool = nn.AvgPool2d(kernel_size=half, stride=half)
+        self._top_third_rows = slice(0, third)
+        self._center_slice = (slice(third, 2 * third), slice(quarter, 3 * quarter))
+        
+        # Heatmap PNGs are encoded in memory and flushed to disk off the request path
+        self.heatmap_dir = "heatmaps"
+        os.makedirs(self.heatmap_dir, exist_ok=True)
+        self._heatmap_writer = ThreadPoolExecutor(max_workers=2,
+                                                  thread_name_prefix="heatmap-writer")
+        self._pending_writes = set()
+        self._pending_lock = threading.Lock()
+        atexit.register(self.close)
+        
+        # Pay cuDNN autotuning / compilation / session setup once here rather
+        # than on the first request
+        self._warmup()
+    
+    def _warmup(self):
+        """Run dummy forward passes through the active inference backend"""
+        dummy = torch.zeros((1, 3, self.input_size, self.input_size))
+        if self.ort_session is not None:
+            self.ort_session.run(None, {'x': dummy.numpy()})
+            return
+        # reduce-overhead records its CUDA graph after the first compiled call
+        for _ in range(2 if self.use_amp else 1):
+            self._predict_torch(dummy)
+        if self.device.type == 'cuda':
+            torch.cuda.synchronize()
+    
+    def _load_onnx(self, model_path: str):
+        """
+        Export the saliency model to ONNX (cached in MODEL_CACHE_DIR) and open an
+        ONNX Runtime session for it. Returns None if export or loading fails,
+        leaving the PyTorch model in use.
+        """
+        try:
+            # The exported graph has a fixed input shape, so each size gets its own file
+            onnx_path = _artifact_path(model_path, f'_{self.input_size}.onnx')
+            if not os.path.exists(onnx_path):
+                dummy = torch.zeros(1, 3, self.input_size, self.input_size, device=self.device)
+                # Export under a temporary name so a failed export leaves nothing behind
+                tmp_path = f"{onnx_path}.{os.getpid()}.tmp"
+                try:
+                    torch.onnx.export(self.model, dummy, tmp_path, opset_version=17,
+                                      input_names=['x'], output_names=['y'])
+                    os.replace(tmp_path, onnx_path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.unlink(tmp_path)
+            
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            
+            # Fixed 1x3xSxS input, so TensorRT engines can be built once and cached
+            available = ort.get_available_providers()
+            providers = []
+            if 'TensorrtExecutionProvider' in available:
+                providers.append(('TensorrtExecutionProvider', {
+                    'trt_fp16_enable': True,
+                    'trt_engine_cache_enable': True,
+                    'trt_engine_cache_path': MODEL_CACHE_DIR,
+                }))
+            if 'CUDAExecutionProvider' in available:
+                providers.append('CUDAExecutionProvider')
+            providers.append('CPUExecutionProvider')
+            
+            session = ort.InferenceSession(onnx_path, sess_options=options, providers=providers)
+            print(f"Using ONNX Runtime for saliency model ({session.get_providers()[0]})")
+            return session
+        except Exception as e:
+            print(f"Warning: ONNX Runtime unavailable for saliency model: {e}. Using PyTorch.")
+            return None
+    
+    def _optimize_for_cpu(self, model_path: str):
+        """
+        Return the model scripted and optimized for CPU inference. The scripted
+        module is cached in MODEL_CACHE_DIR so startup skips scripting;
+        optimization runs on load. Falls back to the eager model.
+        """
+        try:
+            scripted_path = _artifact_path(model_path, '.ts.pt')
+            if os.path.exists(scripted_path):
+                scripted = torch.jit.load(scripted_path, map_location='cpu')
+            else:
+                scripted = torch.jit.script(self.model.eval())
+                # Not being able to cache only costs scripting again next startup
+                try:
+                    _save_scripted(scripted, scripted_path)
+                except Exception as e:
+                    print(f"Warning: could not cache TorchScript saliency model: {e}")
+            return torch.jit.optimize_for_inference(scripted.eval())
+        except Exception as e:
+            print(f"Warning: TorchScript optimization failed for saliency model: {e}. Using eager model.")
+            return self.model
+    
+    def _load_quantized(self, model_path: str,
+                        calibration_images: Optional[List[str]] = None):
+        """
+        Load the INT8 TorchScript model cached in MODEL_CACHE_DIR, or build it with
+        FX post-training static quantization calibrated on calibration_images.
+        Returns None if no cache exists for this checkpoint and it cannot be built.
+        """
+        try:
+            quantized_path = _artifact_path(model_path, '.int8.pt')
+            if os.path.exists(quantized_path):
+                model = torch.jit.load(quantized_path, map_location='cpu')
+                print(f"Loaded INT8 saliency model from {quantized_path}")
+                return model
+            
+            if not calibration_images:
+                print("Warning: INT8 quantization needs calibration_images. Using FP32 model.")
+                return None
+            
+            from torch.ao.quantization import get_default_qconfig_mapping
+            from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+            
+            example = torch.zeros(1, 3, self.input_size, self.input_size)
+            prepared = prepare_fx(self.model.eval(), get_default_qconfig_mapping('x86'),
+                                  example_inputs=(example,))
+            with torch.inference_mode():
+                for path in calibration_images:
+                    image = Image.open(path).convert('RGB')
+                    prepared(self._preprocess(image).unsqueeze(0))
+            
+            model = torch.jit.script(convert_fx(prepared))
+            _save_scripted(model, quantized_path)
+            print(f"Saved INT8 saliency model to {quantized_path}")
+            return model
+        except Exception as e:
+            print(f"Warning: INT8 quantization failed for saliency model: {e}. Using FP32 model.")
+            return None
     
     def analyze_design(self, image_path: str) -> Dict:
         """Main analysis function"""
-        # Load and preprocess image
-        image = Image.open(image_path).convert('RGB')
-        image_tensor = self.transform(image).unsqueeze(0).to(self.device)
+        return self.analyze_designs([image_path])[0]
+    
+    def analyze_designs(self, image_paths: List[str]) -> List[Dict]:
+        """Analyze several designs with a single batched forward pass"""
+        # Load and preprocess images
+        images = [Image.open(path).convert('RGB') for path in image_paths]
+        cpu_batch = torch.stack([self._preprocess(image) for image in images])
+        
+        if self.ort_session is not None:
+            # The exported graph has a fixed batch size of 1
+            saliency = torch.from_numpy(np.concatenate([
+                self.ort_session.run(None, {'x': tensor.unsqueeze(0).numpy()})[0]
+                for tensor in cpu_batch
+            ]))
+        else:
+            saliency = self._predict_torch(cpu_batch)
+        
+        # Region statistics are reduced where the maps live, then fetched at once
+        region_stats = self._region_stats(saliency)
         
-        # Generate saliency map
-        with torch.no_grad():
-            saliency_map = self.model(image_tensor)
+        # Heatmaps are upscaled to each original size before leaving the device;
+        # consumed lazily so later copies overlap building earlier results
+        saliency_full = self._upscaled_heatmaps(saliency, images)
         
-        # Convert to numpy
-        saliency_np = saliency_map.squeeze().cpu().numpy()
+        return [
+            self._build_result(image, upscaled, stats, image_path)
+            for image, upscaled, stats, image_path
+            in zip(images, saliency_full, region_stats, image_paths)
+        ]
+    
+    def _preprocess(self, image: Image.Image) -> torch.Tensor:
+        """
+        Resize a PIL image to the model input as a (3, input_size, input_size) float tensor
+        in [0, 1]. Resizing runs on the uint8 tensor (antialiased bilinear,
+        matching PIL) instead of through PIL + ToTensor.
+        """
+        tensor = torch.from_numpy(np.array(image)).permute(2, 0, 1)
+        tensor = TF.resize(tensor, [self.input_size, self.input_size], antialias=True)
+        return tensor.float().div_(255)
+    
+    def _build_result(self, image: Image.Image, saliency_full: np.ndarray,
+                      region_stats: List[float], image_path: str) -> Dict:
+        """Turn one predicted saliency map into the analysis result"""
+        quadrant_means = region_stats[:4]
+        top_third, center, variance = region_stats[4:]
         
         # Analyze attention distribution
-        attention_areas = self._analyze_attention_areas(saliency_np)
-        score = self._calculate_attention_score(saliency_np, attention_areas)
+        attention_areas = self._analyze_attention_areas(quadrant_means)
+        score = self._calculate_attention_score(variance, top_third, center)
         
         # Save heatmap
-        heatmap_path = self._save_heatmap(image, saliency_np, image_path)
+        heatmap_path = self._save_heatmap(image, saliency_full, image_path)
         
         # Generate recommendations
         recommendations = self._generate_recommendations(attention_areas)
@@ -127,24 +440,107 @@ class AttentionAnalyzer:
             "recommendations": recommendations
         }
     
-    def _analyze_attention_areas(self, saliency_map: np.ndarray) -> List[Dict]:
+    def _predict_torch(self, cpu_batch: torch.Tensor) -> torch.Tensor:
+        """
+        Run the PyTorch saliency model on a preprocessed (N, 3, H, W) CPU batch
+        Returns the (N, 1, H, W) float32 saliency maps, left on the model device
+        """
+        with self._input_lock:
+            input_buf = self._input_bufs.get(cpu_batch.shape[0])
+            if input_buf is None:
+                input_buf = torch.empty(cpu_batch.shape,
+                                        memory_format=torch.channels_last,
+                                        pin_memory=self.device.type == 'cuda')
+                self._input_bufs[cpu_batch.shape[0]] = input_buf
+            input_buf.copy_(cpu_batch)
+            if self.device.type == 'cuda':
+                # Upload on a side stream so it can overlap a forward still
+                # running on the compute stream from the previous call
+                compute_stream = torch.cuda.current_stream()
+                with torch.cuda.stream(self._upload_stream):
+                    image_tensor = input_buf.to(self.device, non_blocking=True)
+                    uploaded = torch.cuda.Event()
+                    uploaded.record()
+                compute_stream.wait_stream(self._upload_stream)
+                image_tensor.record_stream(compute_stream)
+            else:
+                image_tensor = input_buf
+            
+            # Generate saliency maps
+            with torch.inference_mode(), torch.autocast(device_type=self.device.type,
+                                                        dtype=self.amp_dtype,
+                                                        enabled=self.use_amp):
+                saliency_map = self.model(image_tensor)
+                # Own fp32 copy: compiled CUDA graphs reuse their output memory
+                saliency_map = saliency_map.to(torch.float32, copy=True)
+            
+            # The staging buffer can be refilled once the upload has finished
+            if self.device.type == 'cuda':
+                uploaded.synchronize()
+            
+            return saliency_map
+    
+    @torch.inference_mode()
+    def _upscale_saliency(self, saliency: torch.Tensor, size) -> torch.Tensor:
+        """
+        Bilinearly upscale a (1, 1, h, w) saliency map to a PIL (width, height)
+        size on its device and return it as an (H, W) uint8 tensor
+        """
+        upscaled = F.interpolate(saliency, size=size[::-1], mode='bilinear',
+                                 align_corners=False)
+        return upscaled[0, 0].mul_(255).clamp_(0, 255).byte()
+    
+    def _upscaled_heatmaps(self, saliency: torch.Tensor, images: List[Image.Image]):
+        """
+        Yield each saliency map upscaled to its image's size as an (H, W) uint8
+        array. For CUDA maps every device-to-host copy is queued up front on a
+        download stream, so later copies run while earlier results are built.
+        """
+        upscaled = [
+            self._upscale_saliency(saliency[i:i + 1], image.size)
+            for i, image in enumerate(images)
+        ]
+        if not saliency.is_cuda:
+            yield from (heatmap.numpy() for heatmap in upscaled)
+            return
+        
+        self._download_stream.wait_stream(torch.cuda.current_stream())
+        copies = []
+        with torch.cuda.stream(self._download_stream):
+            for heatmap in upscaled:
+                host = torch.empty(heatmap.shape, dtype=torch.uint8, pin_memory=True)
+                host.copy_(heatmap, non_blocking=True)
+                heatmap.record_stream(self._download_stream)
+                copied = torch.cuda.Event()
+                copied.record()
+                copies.append((host, copied))
+        
+        for host, copied in copies:
+            copied.synchronize()
+            yield host.numpy()
+    
+    @torch.inference_mode()
+    def _region_stats(self, saliency: torch.Tensor) -> List[List[float]]:
+        """
+        Per-map attention statistics for an (N, 1, H, W) saliency batch, reduced
+        on the batch's device and copied to the host in a single transfer
+        Rows are [top_left, top_right, bottom_left, bottom_right, top_third,
+        center, variance]; the first six are mean attention per region
+        """
+        quadrants = self._quad_pool(saliency).flatten(1)
+        top_third = saliency[..., self._top_third_rows, :].mean(dim=(1, 2, 3))
+        center = saliency[(..., *self._center_slice)].mean(dim=(1, 2, 3))
+        variance = saliency.var(dim=(1, 2, 3), unbiased=False)
+        return torch.cat([quadrants, torch.stack([top_third, center, variance], dim=1)],
+                         dim=1).cpu().tolist()
+    
+    def _analyze_attention_areas(self, quadrant_means: List[float]) -> List[Dict]:
         """Identify key attention areas"""
-        # Threshold to find high attention regions
-        threshold = np.percentile(saliency_map, 90)
-        high_attention = saliency_map > threshold
-        
-        # Divide image into quadrants
-        h, w = saliency_map.shape
-        quadrants = {
-            "top_left": saliency_map[0:h//2, 0:w//2],
-            "top_right": saliency_map[0:h//2, w//2:w],
-            "bottom_left": saliency_map[h//2:h, 0:w//2],
-            "bottom_right": saliency_map[h//2:h, w//2:w]
-        }
+        # Quadrant means come precomputed in TL, TR, BL, BR order
+        quadrants = ("top_left", "top_right", "bottom_left", "bottom_right")
         
         attention_areas = []
-        for name, quadrant in quadrants.items():
-            avg_attention = np.mean(quadrant)
+        for name, avg_attention in zip(quadrants, quadrant_means):
             attention_areas.append({
                 "region": name,
                 "attention_level": float(avg_attention),
@@ -156,21 +552,16 @@ class AttentionAnalyzer:
         
         return attention_areas
     
-    def _calculate_attention_score(self, saliency_map: np.ndarray,
-                                   attention_areas: List[Dict]) -> float:
+    def _calculate_attention_score(self, variance: float,
+                                   top_third: float, center: float) -> float:
         """Calculate attention distribution score"""
         # Good attention distribution:
         # - Focus on top areas (F-pattern)
         # - Not too uniform (boring)
         # - Not too concentrated (overwhelming)
         
-        # Calculate attention variance
-        variance = np.var(saliency_map)
-        
-        # Check if attention is in optimal areas (top and center)
-        h, w = saliency_map.shape
-        top_third = np.mean(saliency_map[0:h//3, :])
-        center = np.mean(saliency_map[h//3:2*h//3, w//4:3*w//4])
+        # Attention variance and mean attention in optimal areas (top and
+        # center) come precomputed
         
         # Score based on:
         # 1. Variance (not too uniform, not too concentrated)
@@ -183,35 +574,59 @@ class AttentionAnalyzer:
         return min(100, max(0, final_score))
     
     def _save_heatmap(self, original_image: Image.Image,
-                     saliency_map: np.ndarray,
+                     saliency_full: np.ndarray,
                      original_path: str) -> str:
-        """Save attention heatmap overlay"""
-        # Resize saliency map to original image size
-        saliency_resized = Image.fromarray(
-            (saliency_map * 255).astype(np.uint8)
-        ).resize(original_image.size, Image.BILINEAR)
-        
-        # Convert to numpy
-        saliency_array = np.array(saliency_resized)
-        
+        """Save attention heatmap overlay from a full-resolution uint8 saliency map"""
         # Create heatmap (red = high attention)
-        from matplotlib import cm
-        colormap = cm.get_cmap('jet')
-        heatmap = colormap(saliency_array / 255.0)[:, :, :3]
-        heatmap = (heatmap * 255).astype(np.uint8)
+        heatmap = JET_LUT[saliency_full]
         
-        # Blend with original
-        heatmap_img = Image.fromarray(heatmap)
-        blended = Image.blend(original_image, heatmap_img, alpha=0.5)
+        # Blend with original (alpha=0.5 reduces to an average)
+        original = np.asarray(original_image, dtype=np.uint16)
+        blended = Image.fromarray(((original + heatmap) >> 1).astype(np.uint8))
+        
+        # Encode with fast zlib level; previews don't need tight compression
+        buffer = io.BytesIO()
+        blended.save(buffer, format='PNG', compress_level=1)
         
         # Save
         base_name = os.path.splitext(os.path.basename(original_path))[0]
-        heatmap_path = f"heatmaps/{base_name}_heatmap.png"
-        os.makedirs("heatmaps", exist_ok=True)
-        blended.save(heatmap_path)
+        heatmap_path = f"{self.heatmap_dir}/{base_name}_heatmap.png"
+        future = self._heatmap_writer.submit(self._write_file, heatmap_path, buffer.getvalue())
+        with self._pending_lock:
+            self._pending_writes.add(future)
+        future.add_done_callback(self._write_done)
         
         return heatmap_path
     
+    def _write_done(self, future):
+        with self._pending_lock:
+            self._pending_writes.discard(future)
+        if future.exception() is not None:
+            print(f"Warning: failed to write heatmap: {future.exception()}")
+    
+    @staticmethod
+    def _write_file(path: str, data: bytes):
+        """Write via a temporary file so a heatmap is never served half-written"""
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    
+    def flush(self):
+        """Block until every heatmap returned so far has been written to disk"""
+        with self._pending_lock:
+            pending = list(self._pending_writes)
+        wait(pending)
+    
+    def close(self):
+        """Finish outstanding heatmap writes and stop the writer threads"""
+        self._heatmap_writer.shutdown(wait=True)
+        atexit.unregister(self.close)
+    
     def _generate_recommendations(self, attention_areas: List[Dict]) -> List[str]:
         """Generate recommendations based on attention distribution"""
         recommendations = []
@@ -248,4 +663,17 @@ class AttentionAnalyzer:
                 "Attention distribution looks good!"
             )
         
-        return recommendations
\ No newline at end of file
+        return recommendations
+
+
+@functools.lru_cache(maxsize=1)
+def get_saliency_analyzer(model_path: str, use_onnx: bool = False,
+                          input_size: int = 256) -> AttentionAnalyzer:
+    """
+    Shared saliency-model AttentionAnalyzer for model_path. Construction loads,
+    compiles and warms up the model, so callers should use this instead of
+    instantiating AttentionAnalyzer per call. Not to be confused with
+    app.api.analysis.get_attention_analyzer, which returns the
+    ComprehensiveAttentionAnalyzer used by the API.
+    """
+    return AttentionAnalyzer(model_path, use_onnx=use_onnx, input_size=input_size)
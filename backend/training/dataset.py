@@ -5,6 +5,26 @@ from PIL import Image
 import torchvision.transforms as transforms
 import numpy as np
 import cv2
+from functools import lru_cache
+from multiprocessing import Pool
+
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+@lru_cache(maxsize=8)
+def _center_bias(h, w):
+    """
+    Radial center-bias prior scaled to 0-255, cached per image size
+    (synthetic maps are usually generated for many same-sized images)
+    """
+    y, x = np.ogrid[:h, :w]
+    center_y, center_x = h // 2, w // 2
+    distance = np.sqrt((x - center_x) ** 2 + (y - center_y) ** 2)
+    max_distance = np.sqrt(center_x ** 2 + center_y ** 2)
+    center_bias = np.rint((1 - (distance / max_distance)) * 255).astype(np.uint8)
+    center_bias.flags.writeable = False
+    return center_bias
 
 
 class SaliencyDataset(Dataset):
@@ -23,14 +43,17 @@ class SaliencyDataset(Dataset):
         self.saliency_dir = saliency_dir
         self.image_size = image_size
         
-        # Get list of images
+        # Get list of images (one scan of saliency_dir instead of a stat per image);
+        # a missing saliency_dir just means no pairs yet
+        saliency_files = set()
+        if os.path.isdir(saliency_dir):
+            saliency_files = {entry.name for entry in os.scandir(saliency_dir)}
         self.image_files = []
         for file in os.listdir(image_dir):
-            if file.lower().endswith(('.png', '.jpg', '.jpeg')):
+            if file.lower().endswith(IMAGE_EXTENSIONS):
                 # Check if corresponding saliency map exists
                 base_name = os.path.splitext(file)[0]
-                saliency_file = os.path.join(saliency_dir, base_name + '.png')
-                if os.path.exists(saliency_file):
+                if base_name + '.png' in saliency_files:
                     self.image_files.append(file)
         
         print(f"✅ Found {len(self.image_files)} image-saliency pairs")
@@ -74,50 +97,75 @@ class SaliencyDataset(Dataset):
         return image, saliency
 
 
-def create_synthetic_saliency_maps(image_dir, output_dir):
+def _create_synthetic_saliency_map(job):
+    """
+    Build and save the heuristic saliency map for a single image
+    Returns True if a map was written
+    """
+    img_path, output_path = job
+    image = cv2.imread(img_path)
+    
+    if image is None:
+        return False
+    
+    # Create heuristic saliency map
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    
+    # Edge detection
+    edges = cv2.Canny(gray, 50, 150)
+    
+    # Blur to spread attention (kept in uint8, OpenCV's fixed-point fast path)
+    saliency = cv2.GaussianBlur(edges, (21, 21), 0)
+    
+    # Center bias
+    h, w = gray.shape
+    center_bias = _center_bias(h, w)
+    
+    # Combine (uint8 in, saturated uint8 out)
+    saliency = cv2.addWeighted(saliency, 0.6, center_bias, 0.4, 0)
+    
+    # Save
+    cv2.imwrite(output_path, saliency)
+    return True
+
+
+def create_synthetic_saliency_maps(image_dir, output_dir, num_workers=None, skip_existing=True):
     """
     Create synthetic saliency maps for testing (uses heuristics)
     Use this if you don't have ground truth saliency maps
+    
+    Images are processed in parallel across num_workers processes
+    (default: all CPU cores, 1 disables multiprocessing). With
+    skip_existing, images that already have a map in output_dir are
+    left alone so an interrupted run can be resumed.
     """
     os.makedirs(output_dir, exist_ok=True)
+    existing = {entry.name for entry in os.scandir(output_dir)} if skip_existing else set()
     
-    count = 0
+    jobs = []
+    skipped = 0
     for file in os.listdir(image_dir):
-        if file.lower().endswith(('.png', '.jpg', '.jpeg')):
-            img_path = os.path.join(image_dir, file)
-            image = cv2.imread(img_path)
-            
-            if image is None:
+        if file.lower().endswith(IMAGE_EXTENSIONS):
+            map_name = os.path.splitext(file)[0] + '.png'
+            if map_name in existing:
+                skipped += 1
                 continue
-            
-            # Create heuristic saliency map
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
-            # Edge detection
-            edges = cv2.Canny(gray, 50, 150)
-            
-            # Blur to spread attention
-            saliency = cv2.GaussianBlur(edges.astype(float), (21, 21), 0)
-            
-            # Center bias
-            h, w = gray.shape
-            y, x = np.ogrid[:h, :w]
-            center_y, center_x = h // 2, w // 2
-            distance = np.sqrt((x - center_x) ** 2 + (y - center_y) ** 2)
-            max_distance = np.sqrt(center_x ** 2 + center_y ** 2)
-            center_bias = (1 - (distance / max_distance)) * 255
-            
-            # Combine
-            saliency = cv2.addWeighted(saliency, 0.6, center_bias, 0.4, 0)
-            saliency = np.clip(saliency, 0, 255).astype(np.uint8)
-            
-            # Save
-            base_name = os.path.splitext(file)[0]
-            output_path = os.path.join(output_dir, base_name + '.png')
-            cv2.imwrite(output_path, saliency)
-            count += 1
+            jobs.append((
+                os.path.join(image_dir, file),
+                os.path.join(output_dir, map_name)
+            ))
+    
+    num_workers = num_workers or os.cpu_count() or 1
+    if num_workers > 1 and len(jobs) > 1:
+        with Pool(min(num_workers, len(jobs))) as pool:
+            results = pool.imap_unordered(_create_synthetic_saliency_map, jobs, chunksize=16)
+            count = sum(results)
+    else:
+        count = sum(map(_create_synthetic_saliency_map, jobs))
     
     print(f"✅ Created {count} synthetic saliency maps in {output_dir}")
+    if skipped:
+        print(f"   Skipped {skipped} images that already had a map")
 
 
 if __name__ == "__main__":
@@ -14,7 +14,10 @@ from datetime import datetime
 import sys
 sys.path.append('..')
 from app.ai_modules.comprehensive_attention_analyzer import SaliencyModel
-from dataset import SaliencyDataset
+try:
+    from .dataset import SaliencyDataset  # imported as training.train_saliency
+except ImportError:
+    from dataset import SaliencyDataset  # run as a script from training/
 
 
 class SaliencyTrainer:
@@ -147,8 +150,8 @@ class SaliencyTrainer:
         plt.close()
 
 
-def parse_args():
-    """Parse command line arguments"""
+def parse_args(argv=None):
+    """Parse command line arguments (argv defaults to sys.argv[1:])"""
     parser = argparse.ArgumentParser(description='Train U-Net saliency prediction model')
     
     # Data arguments
@@ -159,6 +162,12 @@ def parse_args():
     parser.add_argument('--image_size', type=int, default=256,
                         help='Input image size (default: 256)')
     
+    # Model arguments
+    parser.add_argument('--upsample', type=str, default='transpose',
+                        choices=['transpose', 'bilinear'],
+                        help='Decoder upsampling: transpose (2x2 transposed conv) or '
+                             'bilinear (resize + 3x3 conv, faster inference) (default: transpose)')
+    
     # Training arguments
     parser.add_argument('--batch_size', type=int, default=8,
                         help='Batch size (default: 8, use 16-32 for GPU)')
@@ -177,25 +186,36 @@ def parse_args():
     parser.add_argument('--device', type=str, default='auto',
                         help='Device to use: cpu, cuda, or auto (default: auto)')
     
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def main():
+def main(args=None):
     """
     Main training function
+    
+    Args:
+        args: Parsed arguments (argparse.Namespace or any object with the same
+              attributes, e.g. parse_args([...]) or a SimpleNamespace). When
+              None, arguments are read from the command line. Passing them in
+              lets notebooks train in-process without re-importing torch.
+    
+    Returns:
+        The trained model, or None if no data was found
     """
     print("="*60)
     print("🎓 ARAI Saliency Model Training")
     print("="*60)
     
     # Parse command line arguments
-    args = parse_args()
+    if args is None:
+        args = parse_args()
     
     # Configuration from arguments
     config = {
         'image_dir': args.image_dir,
         'saliency_dir': args.saliency_dir,
         'image_size': args.image_size,
+        'upsample': getattr(args, 'upsample', 'transpose'),
         'batch_size': args.batch_size,
         'num_epochs': args.num_epochs,
         'learning_rate': args.learning_rate,
@@ -277,7 +297,7 @@ def main():
     
     # Initialize model
     print("\n🏗️  Initializing U-Net model...")
-    model = SaliencyModel()
+    model = SaliencyModel(upsample=config['upsample'])
     
     # Count parameters
     total_params = sum(p.numel() for p in model.parameters())
@@ -297,6 +317,7 @@ def main():
     print(f"\n⏰ Training started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("\n" + "="*60)
     
+    trained_model = trainer.model
     try:
         trained_model = trainer.train(
             train_loader=train_loader,
@@ -316,6 +337,8 @@ def main():
     print("   1. Restart your backend server")
     print("   2. Upload a design to test the model")
     print("   3. Compare results with heuristic-based analysis")
+    
+    return trained_model
 
 
 if __name__ == "__main__":